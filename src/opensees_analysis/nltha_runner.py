@@ -79,6 +79,12 @@ class NLTHAConfig:
     # Output
     output_dir: str = "data/raw"
     save_every_n: int = 1  # Save every N steps (1 = all)
+    output_format: str = "csv"  # "csv" | "parquet" (binary, columnar, snappy)
+
+    def __post_init__(self) -> None:
+        if self.output_format not in ("csv", "parquet"):
+            msg = f"output_format must be 'csv' or 'parquet', got {self.output_format!r}"
+            raise ValueError(msg)
 
 
 @dataclass
@@ -252,7 +258,7 @@ class NLTHARunner:
             max_drift: list[float] (per story)
             max_disp: list[float] (per story)
             peak_base_shear: float
-            output_file: str (path to CSV)
+            output_file: str (path to CSV or Parquet time history)
             metadata_file: str (path to JSON)
             convergence_stats: dict
         """
@@ -429,36 +435,50 @@ class NLTHARunner:
         max_disp: list[float],
         peak_base_shear: float,
     ) -> tuple[Path, Path]:
-        """Save CSV data and JSON metadata to data/raw/."""
+        """Save time-history data (CSV or Parquet) and JSON metadata to data/raw/."""
         out_dir = Path(self.config.output_dir)
         out_dir.mkdir(parents=True, exist_ok=True)
 
         safe_name = gm.name.replace("/", "_").replace(" ", "_")
-        csv_path = out_dir / f"{safe_name}.csv"
+        data_path = out_dir / f"{safe_name}.{self.config.output_format}"
         json_path = out_dir / f"{safe_name}_meta.json"
 
-        # ── CSV output ──────────────────────────────────────────────────
+        # ── Time-history output ─────────────────────────────────────────
         headers = ["time", "ground_accel"]
         for i in range(1, self.n_stories + 1):
             headers.extend([f"disp_{i}", f"vel_{i}", f"accel_{i}", f"drift_{i}"])
         headers.append("base_shear")
 
-        with open(csv_path, "w", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow(headers)
-            for idx in range(len(times)):
-                row = [times[idx], ground_accels[idx]]
-                for i in range(self.n_stories):
-                    row.extend(
-                        [
-                            displacements[i][idx],
-                            velocities[i][idx],
-                            accelerations[i][idx],
-                            drifts[i][idx],
-                        ]
-                    )
-                row.append(base_shears[idx])
-                writer.writerow(row)
+        if self.config.output_format == "parquet":
+            import pandas as pd
+
+            columns: dict[str, list[float]] = {"time": times, "ground_accel": ground_accels}
+            for i in range(self.n_stories):
+                columns[f"disp_{i + 1}"] = displacements[i]
+                columns[f"vel_{i + 1}"] = velocities[i]
+                columns[f"accel_{i + 1}"] = accelerations[i]
+                columns[f"drift_{i + 1}"] = drifts[i]
+            columns["base_shear"] = base_shears
+            pd.DataFrame(columns, columns=headers).to_parquet(
+                data_path, engine="pyarrow", compression="snappy", index=False
+            )
+        else:
+            with open(data_path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(headers)
+                for idx in range(len(times)):
+                    row = [times[idx], ground_accels[idx]]
+                    for i in range(self.n_stories):
+                        row.extend(
+                            [
+                                displacements[i][idx],
+                                velocities[i][idx],
+                                accelerations[i][idx],
+                                drifts[i][idx],
+                            ]
+                        )
+                    row.append(base_shears[idx])
+                    writer.writerow(row)
 
         # ── JSON metadata ───────────────────────────────────────────────
         metadata = {
@@ -497,8 +517,8 @@ class NLTHARunner:
         with open(json_path, "w") as f:
             json.dump(metadata, f, indent=2)
 
-        logger.info("Results saved: %s, %s", csv_path.name, json_path.name)
-        return csv_path, json_path
+        logger.info("Results saved: %s, %s", data_path.name, json_path.name)
+        return data_path, json_path
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -44,6 +44,7 @@ Author: Mikisbell
 from __future__ import annotations
 
 import csv
+import functools
 import json
 import logging
 import re
@@ -52,6 +53,7 @@ from dataclasses import asdict, dataclass, field
 from pathlib import Path
 
 import numpy as np
+from scipy.signal import lfilter
 
 from src.opensees_analysis.nltha_runner import (
     GroundMotionRecord,
@@ -318,7 +320,10 @@ def parse_at2_directory(
         logger.error("PEER directory not found: %s", peer_path)
         return []
 
-    at2_files = sorted(peer_path.glob("*.AT2")) + sorted(peer_path.glob("*.at2"))
+    # One directory scan with a case-insensitive suffix test. Separate
+    # "*.AT2" / "*.at2" globs walk the directory twice and, on
+    # case-insensitive filesystems, return every file twice.
+    at2_files = sorted(f for f in peer_path.iterdir() if f.suffix.lower() == ".at2")
     logger.info("Found %d AT2 files in %s", len(at2_files), peer_path)
 
     records = []
@@ -360,19 +365,43 @@ def load_peer_flatfile(path: str | Path) -> dict[int, dict]:
     df = pd.read_csv(fpath, low_memory=False)
     logger.info("Loaded flatfile: %d records", len(df))
 
-    catalog: dict[int, dict] = {}
-    for _, row in df.iterrows():
-        rsn = int(row.get("Record Sequence Number", row.get("RSN", 0)))
-        if rsn == 0:
-            continue
-        catalog[rsn] = {
-            "rsn": rsn,
-            "event": str(row.get("Earthquake Name", "")),
-            "mw": float(row.get("Magnitude", 0)),
-            "rjb": float(row.get("Joyner-Boore Dist. (km)", row.get("Rjb (km)", 0))),
-            "vs30": float(row.get("Vs30 (m/s)", row.get("Vs30", 0))),
-            "fault_type": str(row.get("Mechanism", "")),
-        }
+    def column(*names: str, default: float | str = 0) -> pd.Series:
+        """First flatfile column present among *names* (header aliases)."""
+        for name in names:
+            if name in df.columns:
+                return df[name]
+        return pd.Series(default, index=df.index)
+
+    def numeric(*names: str) -> pd.Series:
+        # Blank cells stay NaN so filter_by_criteria rejects them
+        return pd.to_numeric(column(*names), errors="coerce")
+
+    def text(*names: str) -> np.ndarray:
+        # str() per value, as before: blank cells become "nan", not float NaN
+        return column(*names, default="").astype(object).map(str).to_numpy()
+
+    # Resolve each column once and convert whole columns to ndarrays instead
+    # of dispatching a pandas Series lookup per row via iterrows().
+    rsn = numeric("Record Sequence Number", "RSN").fillna(0).to_numpy(np.int64)
+    event = text("Earthquake Name")
+    mw = numeric("Magnitude").to_numpy(np.float64)
+    rjb = numeric("Joyner-Boore Dist. (km)", "Rjb (km)").to_numpy(np.float64)
+    vs30 = numeric("Vs30 (m/s)", "Vs30").to_numpy(np.float64)
+    fault_type = text("Mechanism")
+
+    keep = rsn != 0
+    catalog: dict[int, dict] = {
+        r: {"rsn": r, "event": ev, "mw": m, "rjb": rj, "vs30": vs, "fault_type": ft}
+        for r, ev, m, rj, vs, ft in zip(
+            rsn[keep].tolist(),
+            event[keep].tolist(),
+            mw[keep].tolist(),
+            rjb[keep].tolist(),
+            vs30[keep].tolist(),
+            fault_type[keep].tolist(),
+            strict=True,
+        )
+    }
 
     return catalog
 
@@ -466,6 +495,110 @@ def asce7_design_spectrum(
     return sa
 
 
+@functools.lru_cache(maxsize=32)
+def _nigam_jennings_filters(
+    dt: float,
+    periods: tuple[float, ...],
+    damping: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """IIR filter form of the Nigam-Jennings SDOF recurrence, per period.
+
+    Cached on ``(dt, periods, damping)``: a GM suite shares one period grid
+    and damping ratio and only a handful of distinct ``dt`` values, so the
+    trigonometric/exponential setup is done once per ``dt`` rather than
+    once per record.
+
+    Returns
+    -------
+    num, den : np.ndarray
+        ``(n_periods, 3)`` lfilter numerator / denominator coefficients.
+    zi_unit : np.ndarray
+        ``(n_periods, 2)`` initial filter state per unit ``p_0`` that
+        enforces ``u_0 = v_0 = 0``.
+    """
+    t = np.array(periods)
+    omega = 2.0 * np.pi / t
+    omega2 = omega**2
+    xi = damping
+    omega_d = omega * np.sqrt(1.0 - xi**2)
+    xi_omega = xi * omega
+
+    # Precompute coefficients (vectorized over periods)
+    exp_term = np.exp(-xi_omega * dt)
+    cos_d = np.cos(omega_d * dt)
+    sin_d = np.sin(omega_d * dt)
+
+    a11 = exp_term * (cos_d + (xi_omega / omega_d) * sin_d)
+    a12 = exp_term * sin_d / omega_d
+    a21 = -omega2 * a12
+    a22 = exp_term * (cos_d - (xi_omega / omega_d) * sin_d)
+
+    one_over_omega2 = 1.0 / omega2
+    t1 = (2.0 * xi**2 - 1.0) / (omega2 * dt)
+    t2 = 2.0 * xi / (omega**3 * dt)
+
+    b11 = exp_term * ((t1 + xi / omega) * sin_d / omega_d + (t2 + one_over_omega2) * cos_d) - t2
+    b12 = -(exp_term * (t1 * sin_d / omega_d + t2 * cos_d)) - one_over_omega2 + t2
+    b21 = exp_term * (
+        (t1 + xi / omega) * (cos_d - xi_omega * sin_d / omega_d)
+        - (t2 + one_over_omega2) * (omega_d * sin_d + xi_omega * cos_d)
+    ) + 1.0 / (omega2 * dt)
+    b22 = -exp_term * (
+        t1 * (cos_d - xi_omega * sin_d / omega_d) - t2 * (omega_d * sin_d + xi_omega * cos_d)
+    ) - 1.0 / (omega2 * dt)
+
+    # The 2-state recurrence [u, v]_{j+1} = A·[u, v]_j + B·[p_j, p_{j+1}] is an
+    # LTI system, so u(t) is the output of a 2nd-order IIR filter on p(t).
+    # Eliminating v gives the transfer function U/P = num(z)/den(z):
+    num = np.stack(
+        [b12, b11 - a22 * b12 + a12 * b22, a12 * b21 - a22 * b11],
+        axis=1,
+    )
+    den = np.stack(
+        [np.ones_like(t), -(a11 + a22), a11 * a22 - a12 * a21],
+        axis=1,
+    )
+    # Initial filter state enforcing u_0 = v_0 = 0 for a non-zero p_0
+    zi_unit = np.stack([-b12, a22 * b12 - a12 * b22], axis=1)
+
+    for arr in (num, den, zi_unit):
+        arr.flags.writeable = False  # shared by every caller through the cache
+    return num, den, zi_unit
+
+
+def sdof_iir_coefficients(
+    dt: float,
+    period: float,
+    damping: float = 0.05,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Nigam-Jennings SDOF filter for one period, ready for ``lfilter``.
+
+    Hoist this out of any loop over records that share ``(dt, period,
+    damping)``; the relative displacement of the whole batch is then
+    ``lfilter(b, a, -acc, axis=-1, zi=zi_unit * -acc[..., :1])[0]``.
+
+    Parameters
+    ----------
+    dt : float
+        Time step (s).
+    period : float
+        SDOF natural period (s), must be positive.
+    damping : float
+        Damping ratio.
+
+    Returns
+    -------
+    b, a : np.ndarray
+        Numerator / denominator coefficients, shape ``(3,)``.
+    zi_unit : np.ndarray
+        Initial filter state per unit ``p_0``, shape ``(2,)``.
+    """
+    if period <= 0:
+        raise ValueError(f"period must be positive, got {period}")
+    num, den, zi_unit = _nigam_jennings_filters(float(dt), (float(period),), float(damping))
+    return num[0], den[0], zi_unit[0]
+
+
 def compute_response_spectrum(
     acc: np.ndarray,
     dt: float,
@@ -481,7 +614,8 @@ def compute_response_spectrum(
     Parameters
     ----------
     acc : np.ndarray
-        Ground acceleration time series (g or m/s²).
+        Ground acceleration time series (g or m/s²), shape ``(T,)``, or a
+        batch of equal-length records with shape ``(N, T)``.
     dt : float
         Time step (s).
     periods : np.ndarray
@@ -492,7 +626,8 @@ def compute_response_spectrum(
     Returns
     -------
     np.ndarray
-        Spectral pseudo-acceleration Sa(T) in same units as input.
+        Spectral pseudo-acceleration Sa(T) in same units as input, shape
+        ``(n_periods,)`` or ``(N, n_periods)`` for batched input.
 
     References
     ----------
@@ -504,71 +639,27 @@ def compute_response_spectrum(
 
     # Handle zero/negative periods: max(abs(acc))
     valid_mask = periods > 0
-    sa = np.zeros_like(periods)
-    sa[~valid_mask] = np.max(np.abs(acc))
+    sa = np.zeros(acc.shape[:-1] + periods.shape)
+    sa[..., ~valid_mask] = np.max(np.abs(acc), axis=-1, keepdims=True)
 
     if not np.any(valid_mask):
         return sa
 
     t = periods[valid_mask]
-    omega = 2.0 * np.pi / t
-    omega2 = omega**2
-    xi = damping
-    omega_d = omega * np.sqrt(1.0 - xi**2)
-    xi_omega = xi * omega
-
-    # Precompute coefficients (vectorized over periods)
-    exp_term = np.exp(-xi_omega * dt)
-    cos_d = np.cos(omega_d * dt)
-    sin_d = np.sin(omega_d * dt)
-
-    a11 = exp_term * (cos_d + (xi_omega / omega_d) * sin_d)
-    a12 = exp_term * sin_d / omega_d
-    a21 = -omega2 * a12
-    a22 = exp_term * (cos_d - (xi_omega / omega_d) * sin_d)
-
-    one_over_omega2 = 1.0 / omega2
-    t1 = (2.0 * xi**2 - 1.0) / (omega2 * dt)
-    t2 = 2.0 * xi / (omega**3 * dt)
-
-    b11 = exp_term * ((t1 + xi / omega) * sin_d / omega_d + (t2 + one_over_omega2) * cos_d) - t2
-    b12 = -(exp_term * (t1 * sin_d / omega_d + t2 * cos_d)) - one_over_omega2 + t2
-    b21 = exp_term * (
-        (t1 + xi / omega) * (cos_d - xi_omega * sin_d / omega_d)
-        - (t2 + one_over_omega2) * (omega_d * sin_d + xi_omega * cos_d)
-    ) + 1.0 / (omega2 * dt)
-    b22 = -exp_term * (
-        t1 * (cos_d - xi_omega * sin_d / omega_d) - t2 * (omega_d * sin_d + xi_omega * cos_d)
-    ) - 1.0 / (omega2 * dt)
+    omega2 = (2.0 * np.pi / t) ** 2
+    num, den, zi_unit = _nigam_jennings_filters(float(dt), tuple(t.tolist()), float(damping))
 
-    # Initialize state vectors [num_valid_periods]
-    u = np.zeros_like(t)
-    v = np.zeros_like(t)
-    sd_max = np.zeros_like(t)
-
-    # Time-stepping loop (vectorized over periods)
-    # We still loop over time, but do all periods at once
-    n = len(acc)
     p = -acc  # Excitation array
+    sd_max = np.zeros(acc.shape[:-1] + t.shape)
 
-    for j in range(n - 1):
-        p_j = p[j]
-        p_j1 = p[j + 1]
-
-        # Update state
-        u_new = a11 * u + a12 * v + b11 * p_j + b12 * p_j1
-        v_new = a21 * u + a22 * v + b21 * p_j + b22 * p_j1
-
-        u = u_new
-        v = v_new
-
-        # Track max displacement
-        abs_u = np.abs(u)
-        mask_update = abs_u > sd_max
-        sd_max[mask_update] = abs_u[mask_update]
+    # One C-level filter pass per period (over all records) instead of a
+    # Python loop over time
+    for k in range(len(t)):
+        u, _ = lfilter(num[k], den[k], p, axis=-1, zi=zi_unit[k] * p[..., :1])
+        sd_max[..., k] = np.max(np.abs(u), axis=-1)
 
     # Pseudo-acceleration: Sa = ω² * Sd
-    sa[valid_mask] = sd_max * omega2
+    sa[..., valid_mask] = sd_max * omega2
 
     return sa
 
@@ -1374,6 +1465,12 @@ def main() -> None:
         default=0,
         help="Limit number of records (0 = no limit)",
     )
+    parser.add_argument(
+        "--output-format",
+        choices=("csv", "parquet"),
+        default="csv",
+        help="Time-history file format (default: csv)",
+    )
     args = parser.parse_args()
 
     config = FactoryConfig(
@@ -1385,6 +1482,7 @@ def main() -> None:
         n_stories=args.n_stories,
         n_workers=args.n_workers,
         limit=args.limit,
+        nltha_config=NLTHAConfig(output_format=args.output_format),
     )
 
     factory = DataFactory(config)
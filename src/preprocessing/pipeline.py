@@ -5,7 +5,7 @@ pipeline.py — NLTHA Data Processing Pipeline for PINN Training
 Transforms raw OpenSeesPy NLTHA time-series outputs into PyTorch-ready
 tensors for the HybridPINN model.
 
-Each raw CSV contains a full time-history simulation with columns::
+Each raw CSV (or Parquet) file contains a full time-history simulation with columns::
 
     time, ground_accel, disp_1..5, vel_1..5, accel_1..5, drift_1..5, base_shear
 
@@ -14,7 +14,7 @@ The pipeline produces:
     - **Target tensors** : ``(N, 5)`` — peak absolute IDR per story
 
 Pipeline stages:
-    1. Ingest     : Load raw CSV + metadata JSON per simulation
+    1. Ingest     : Load raw CSV/Parquet + metadata JSON per simulation
     2. Validate   : Physical bounds, convergence check, NaN detection
     3. Augment    : Window slicing, amplitude scaling, noise injection
     4. Tensorise  : Pad/truncate to seq_len, build (x, y) tensors
@@ -34,6 +34,7 @@ from __future__ import annotations
 
 import json
 import logging
+import math
 from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from pathlib import Path
@@ -49,6 +50,20 @@ try:
 except ImportError:
     OPS_AVAILABLE = False
 
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
@@ -128,18 +143,225 @@ class SimulationRecord:
 # ═══════════════════════════════════════════════════════════════════════════
 
 
+if NUMBA_AVAILABLE:
+    # Reassociation/contraction only: full fastmath implies ``nnan``, which lets
+    # LLVM drop NaN handling and return finite IMs for records containing NaN.
+    _FASTMATH = {"reassoc", "contract"}
+
+    @njit(cache=True, fastmath=_FASTMATH)
+    def _arias_core(acc: np.ndarray, dt: float) -> float:
+        """Fused trapezoidal ∫a²dt — no ``acc**2`` temporary."""
+        n = acc.shape[0]
+        if n == 0:
+            return 0.0
+        s = 0.0
+        for i in range(n):
+            s += acc[i] * acc[i]
+        s -= 0.5 * (acc[0] * acc[0] + acc[n - 1] * acc[n - 1])
+        return (np.pi / (2 * 9.81)) * s * dt
+
+    @njit(cache=True, fastmath=_FASTMATH)
+    def _pgv_core(acc: np.ndarray, dt: float) -> float:
+        """Running velocity and running peak in one loop — no cumsum array."""
+        v = 0.0
+        v_max = 0.0
+        for i in range(acc.shape[0]):
+            v += acc[i]
+            # NaN-propagating peak (``max`` would keep the pre-NaN value)
+            av = abs(v)
+            if av > v_max or av != av:
+                v_max = av
+        return v_max * dt
+
+    @njit(parallel=True, cache=True, fastmath=_FASTMATH)
+    def _im_batch(
+        acc: np.ndarray, dt: float
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """PGA, PGV, Arias and D5-95 per row of ``acc`` (N, T), rows in parallel."""
+        n_rec, n_t = acc.shape
+        pga = np.zeros(n_rec)
+        pgv = np.zeros(n_rec)
+        arias = np.zeros(n_rec)
+        d5_95 = np.zeros(n_rec)
+        if n_t == 0:
+            return pga, pgv, arias, d5_95
+        c_arias = np.pi / (2 * 9.81)
+        for i in prange(n_rec):
+            # Pass 1: peaks of a and running velocity, and Σa²
+            a_max = 0.0
+            v = 0.0
+            v_max = 0.0
+            s = 0.0
+            for j in range(n_t):
+                a = float(acc[i, j])  # float64 accumulation for float32 input
+                aa = abs(a)
+                if aa > a_max or aa != aa:  # NaN-propagating peaks, as np.max
+                    a_max = aa
+                v += a
+                av = abs(v)
+                if av > v_max or av != av:
+                    v_max = av
+                s += a * a
+            pga[i] = a_max
+            pgv[i] = v_max * dt
+            a0 = float(acc[i, 0])
+            an = float(acc[i, n_t - 1])
+            arias[i] = c_arias * (s - 0.5 * (a0 * a0 + an * an)) * dt
+            if s != s:
+                d5_95[i] = np.nan  # no Husid curve through a NaN sample
+                continue
+            # Pass 2: Husid crossings of 5 % and 95 % of Σa²
+            h = 0.0
+            i05 = -1
+            i95 = 0
+            for j in range(n_t):
+                a = float(acc[i, j])
+                h += a * a
+                if i05 < 0 and h >= 0.05 * s:
+                    i05 = j
+                if h >= 0.95 * s:
+                    i95 = j
+                    break
+            d5_95[i] = (i95 - i05) * dt
+        return pga, pgv, arias, d5_95
+
+    @njit(cache=True, fastmath=True, parallel=True)
+    def _standardize_inplace(arr: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Column-wise z-score of ``arr`` (N, K) in place; returns (mean, std).
+
+        One thread per feature column, float64 accumulators, and the same
+        ``std < 1e-8 → 1`` guard as the NumPy path.
+        """
+        n, k = arr.shape
+        mus = np.empty(k)
+        sds = np.empty(k)
+        for j in prange(k):
+            s = 0.0
+            for i in range(n):
+                s += arr[i, j]
+            mu = s / n
+            ss = 0.0
+            for i in range(n):
+                d = arr[i, j] - mu
+                ss += d * d
+            sd = math.sqrt(ss / n)
+            if sd < 1e-8:
+                sd = 1.0
+            inv = 1.0 / sd
+            for i in range(n):
+                arr[i, j] = (arr[i, j] - mu) * inv
+            mus[j] = mu
+            sds[j] = sd
+        return mus, sds
+
+
 def compute_arias_intensity(acc: np.ndarray, dt: float) -> float:
     r"""Arias intensity: :math:`I_a = (\pi/2g) \int a^2(t)\,dt`."""
+    if NUMBA_AVAILABLE:
+        return float(_arias_core(np.asarray(acc), dt))
+    acc = np.asarray(acc)
+    if acc.size == 0:
+        return 0.0
+    # Trapezoid of a² as one dot product plus endpoint correction: no a²
+    # temporary, and float64 accumulation without a float64 copy of the input
     g = 9.81
-    return float((np.pi / (2 * g)) * np.trapezoid(acc**2, dx=dt))
+    a0, an = float(acc[0]), float(acc[-1])
+    s = float(np.einsum("i,i->", acc, acc, dtype=np.float64)) - 0.5 * (a0 * a0 + an * an)
+    return float((np.pi / (2 * g)) * s * dt)
 
 
 def compute_pgv(acc: np.ndarray, dt: float) -> float:
     """Peak Ground Velocity via numerical integration (m/s)."""
+    if NUMBA_AVAILABLE:
+        return float(_pgv_core(np.asarray(acc), dt))
     vel = np.cumsum(acc) * dt
     return float(np.max(np.abs(vel)))
 
 
+def extract_intensity_measures_batch(
+    acc: np.ndarray,
+    dt: float,
+    period: float | None = None,
+    damping: float = 0.05,
+) -> dict[str, np.ndarray]:
+    """Intensity measures for a batch of equal-length records in one pass per IM.
+
+    Parameters
+    ----------
+    acc : np.ndarray
+        Ground acceleration histories, shape ``(N, T)`` (m/s²).
+    dt : float
+        Time step shared by all records (s).
+    period : float or None
+        If given, also compute pseudo-spectral acceleration Sa at this period (s).
+    damping : float
+        SDOF damping ratio for Sa.
+
+    Returns
+    -------
+    dict[str, np.ndarray]
+        ``pga``, ``pgv``, ``arias``, ``d5_95`` (and ``sa``), each shape ``(N,)``.
+        Empty histories (``T == 0``) give zeros for every IM.
+    """
+    acc = np.atleast_2d(acc)
+    g = 9.81
+
+    if acc.shape[1] == 0:
+        keys = ("pga", "pgv", "arias", "d5_95") + (() if period is None else ("sa",))
+        return {k: np.zeros(acc.shape[0]) for k in keys}
+
+    if NUMBA_AVAILABLE:
+        # Compiled per input dtype, so float32 histories are read as-is
+        # (no float64 copy); ascontiguousarray only copies strided views.
+        pga, pgv, arias, d5_95 = _im_batch(np.ascontiguousarray(acc), dt)
+    else:
+        # float64 accumulation and results, as in the numba kernel
+        pga = np.abs(acc).max(axis=1).astype(np.float64)
+        pgv = np.abs(np.cumsum(acc, axis=1, dtype=np.float64) * dt).max(axis=1)
+
+        # Arias intensity and 5–95 % significant duration share the a²
+        # history; Σa² is the last Husid sample, so the trapezoid is that total
+        # minus the endpoint half-weights rather than another pass over the rows.
+        acc_sq = np.square(acc, dtype=np.float64)
+        husid = np.cumsum(acc_sq, axis=1)
+        total = husid[:, -1:]
+        arias = (np.pi / (2 * g)) * (total[:, 0] - 0.5 * (acc_sq[:, 0] + acc_sq[:, -1])) * dt
+        i05 = np.argmax(husid >= 0.05 * total, axis=1)
+        i95 = np.argmax(husid >= 0.95 * total, axis=1)
+        d5_95 = np.where(np.isnan(total[:, 0]), np.nan, (i95 - i05) * dt)
+
+    ims = {"pga": pga, "pgv": pgv, "arias": arias, "d5_95": d5_95}
+
+    if period is not None and period > 0:
+        from scipy.signal import lfilter
+
+        from src.preprocessing.data_factory import sdof_iir_coefficients
+
+        # Filter set up once, then a single lfilter pass over all records
+        b, a, zi_unit = sdof_iir_coefficients(dt, period, damping)
+        p = -acc
+        u, _ = lfilter(b, a, p, axis=1, zi=zi_unit * p[:, :1])
+        ims["sa"] = np.abs(u).max(axis=1) * (2.0 * np.pi / period) ** 2
+    elif period is not None:
+        ims["sa"] = pga.copy()
+
+    return ims
+
+
+def _write_json(path: Path, obj: Any) -> None:
+    """Write ``obj`` as indented JSON, via orjson when installed.
+
+    NumPy arrays/scalars serialise natively with orjson; anything else it
+    cannot encode (e.g. ``Path``) falls back to ``str`` like ``json.dump``.
+    """
+    if ORJSON_AVAILABLE:
+        opts = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        path.write_bytes(orjson.dumps(obj, default=str, option=opts))
+        return
+    with open(path, "w") as f:
+        json.dump(obj, f, indent=2, default=str)
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # Main pipeline class
 # ═══════════════════════════════════════════════════════════════════════════
@@ -169,35 +391,70 @@ class NLTHAPipeline:
         raw = Path(self.config.raw_dir)
         records: list[SimulationRecord] = []
 
-        csv_files = sorted(f for f in raw.glob("*.csv") if not f.name.startswith("factory_summary"))
+        # Single directory scan, filtered by suffix (instead of one glob per format)
+        candidates = sorted(
+            f
+            for f in (raw.iterdir() if raw.is_dir() else ())
+            if f.suffix in (".csv", ".parquet") and not f.name.startswith("factory_summary")
+        )
+
+        # One file per simulation: a campaign re-run with another output format
+        # leaves GM.csv next to GM.parquet, and ingesting both would duplicate
+        # the record (possibly across train/test). Prefer the Parquet copy.
+        by_stem: dict[str, Path] = {}
+        for f in candidates:
+            prev = by_stem.get(f.stem)
+            if prev is not None:
+                keep = f if f.suffix == ".parquet" else prev
+                logger.warning("Both %s and %s exist; using %s", prev.name, f.name, keep.name)
+                by_stem[f.stem] = keep
+            else:
+                by_stem[f.stem] = f
+        data_files = list(by_stem.values())
 
-        for csv_path in csv_files:
-            meta_path = csv_path.with_name(csv_path.stem + "_meta.json")
+        for data_path in data_files:
+            meta_path = data_path.with_name(data_path.stem + "_meta.json")
             try:
-                rec = self._load_one(csv_path, meta_path)
+                rec = self._load_one(data_path, meta_path)
                 records.append(rec)
             except Exception as e:
-                logger.warning("Skipping %s: %s", csv_path.name, e)
+                logger.warning("Skipping %s: %s", data_path.name, e)
 
         logger.info("Ingested %d simulation records", len(records))
         self.metadata["n_records_raw"] = len(records)
         return records
 
-    def _load_one(self, csv_path: Path, meta_path: Path) -> SimulationRecord:
-        """Load a single simulation CSV + metadata JSON."""
+    def _load_one(self, data_path: Path, meta_path: Path) -> SimulationRecord:
+        """Load a single simulation CSV/Parquet + metadata JSON."""
         import pandas as pd
 
-        df = pd.read_csv(csv_path)
+        if data_path.suffix == ".parquet":
+            df = pd.read_parquet(data_path)
+        else:
+            # Every column is numeric: parse straight to float32, in native code
+            # via pyarrow when it is installed, else with pandas' C engine.
+            try:
+                df = pd.read_csv(data_path, engine="pyarrow", dtype=np.float32)
+            except (ImportError, ValueError):
+                df = pd.read_csv(data_path, dtype=np.float32)
+
+        # Convert the whole table to one float32 block once, then take each
+        # field from it, instead of a DataFrame subset + cast per field.
+        block = df.to_numpy(dtype=np.float32)  # (T, n_cols)
+        col_idx = {c: j for j, c in enumerate(df.columns)}
 
-        ground_accel = df["ground_accel"].values.astype(np.float32)
+        def take(cols: list[str]) -> np.ndarray:
+            return block[:, [col_idx[c] for c in cols]]
+
+        ground_accel = block[:, col_idx["ground_accel"]].copy()
         drift_cols = [f"drift_{i}" for i in range(1, self.config.n_stories + 1)]
-        drift = df[drift_cols].values.astype(np.float32)  # (T, 5)
+        drift = take(drift_cols)  # (T, 5)
 
         accel_cols = [f"accel_{i}" for i in range(1, self.config.n_stories + 1)]
-        accel = df[accel_cols].values.astype(np.float32)  # (T, 5)
+        accel = take(accel_cols)  # (T, 5)
 
         vel_cols = [f"vel_{i}" for i in range(1, self.config.n_stories + 1)]
-        vel = df[vel_cols].values.astype(np.float32)  # (T, 5)
+        vel = take(vel_cols)  # (T, 5)
 
         dt = 0.01
         converged = True
@@ -209,7 +466,7 @@ class NLTHAPipeline:
 
         # Critical v2.0 Check: dt must be valid for physics loss
         if dt <= 0.0:
-            logger.warning("Invalid dt=%f for %s. Defaulting to 0.01", dt, csv_path.name)
+            logger.warning("Invalid dt=%f for %s. Defaulting to 0.01", dt, data_path.name)
             dt = 0.01
 
         pga = float(np.max(np.abs(ground_accel)))
@@ -219,16 +476,11 @@ class NLTHAPipeline:
         # v2.0: Load displacement history for sequence target
         # Assuming disp cols exist (produced by nltha_runner)
         disp_cols = [f"disp_{i}" for i in range(1, self.config.n_stories + 1)]
-        if all(c in df.columns for c in disp_cols):
-            disp = df[disp_cols].values.astype(np.float32)
-        else:
-            # Reconstruct from drift? Or just warn?
-            # For now, if missing, use drift (IDR) as proxy? No, bad.
-            # Assuming disp exists.
-            disp = np.zeros_like(drift)
+        # If missing, fall back to zeros (drift is not a valid proxy)
+        disp = take(disp_cols) if all(c in col_idx for c in disp_cols) else np.zeros_like(drift)
 
         return SimulationRecord(
-            name=csv_path.stem,
+            name=data_path.stem,
             ground_accel=ground_accel,
             drift=drift,
             disp=disp,  # Add explicit disp field
@@ -240,7 +492,7 @@ class NLTHAPipeline:
             peak_idr=peak_idr,
             peak_idr_overall=peak_idr_overall,
             converged=converged,
-            source_file=csv_path.name,
+            source_file=data_path.name,
         )
 
     # ── Stage 2: Validate ──────────────────────────────────────────────
@@ -268,7 +520,10 @@ class NLTHAPipeline:
                     self.config.max_pga,
                 )
                 continue
-            if np.any(np.isnan(rec.ground_accel)) or np.any(np.isnan(rec.drift)):
+            # pga / peak_idr_overall are np.max reductions over ground_accel /
+            # drift, which propagate NaN — no need to rescan (and allocate
+            # boolean masks for) the full histories here.
+            if np.isnan(rec.pga) or np.isnan(rec.peak_idr_overall):
                 logger.info("  Skipping %s: contains NaN", rec.name)
                 continue
             valid.append(rec)
@@ -286,64 +541,69 @@ class NLTHAPipeline:
 
     def augment(
         self, records: list[SimulationRecord]
-    ) -> tuple[list[np.ndarray], list[np.ndarray], list[np.ndarray], list[np.ndarray]]:
-        """Generate augmented (input, target, accel, vel) tuples.
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Generate augmented (input, target, accel, vel, dt) samples.
+
+        The sample count is known up front (windows × scales [+ noisy copies]),
+        so outputs are preallocated and filled in place rather than collected
+        as per-sample arrays and stacked again in ``tensorise``.
 
         Returns
         -------
-        inputs : list[np.ndarray] (N, seq_len)
-        targets : list[np.ndarray] (N, n_stories)
-        accels : list[np.ndarray] (N, n_stories, seq_len)
-        vels : list[np.ndarray] (N, n_stories, seq_len)
+        inputs : np.ndarray (N, seq_len)
+        targets : np.ndarray (N, n_stories) or (N, seq_len, n_stories)
+        accels : np.ndarray (N, seq_len, n_stories)
+        vels : np.ndarray (N, seq_len, n_stories)
+        dts : np.ndarray (N,)
         """
-        inputs: list[np.ndarray] = []
-        targets: list[np.ndarray] = []
-        accels: list[np.ndarray] = []
-        vels: list[np.ndarray] = []
-        dts: list[float] = []
         seq_len = self.config.seq_len
-
-        for rec in records:
-            n = len(rec.ground_accel)
-
-            # Extract windows for all fields
-            # We assume extract_windows logic applies identically to 1D and 2D arrays (with minor mod)
-            win_indices = self._get_window_indices(n, seq_len)
-
+        n_stories = self.config.n_stories
+        scales = self.config.amplitude_scales
+        add_noise = self.config.noise_sigma > 0
+
+        # We assume extract_windows logic applies identically to 1D and 2D arrays (with minor mod)
+        windows = [self._get_window_indices(len(rec.ground_accel), seq_len) for rec in records]
+        if self.config.augment:
+            per_window = len(scales) + (sum(scale == 1.0 for scale in scales) if add_noise else 0)
+        else:
+            per_window = 1
+        n = per_window * sum(len(w) for w in windows)
+
+        target_shape = (seq_len, n_stories) if self.config.output_sequence else (n_stories,)
+        inputs = np.empty((n, seq_len), dtype=np.float32)
+        targets = np.empty((n, *target_shape), dtype=np.float32)
+        accels = np.empty((n, seq_len, n_stories), dtype=np.float32)
+        vels = np.empty((n, seq_len, n_stories), dtype=np.float32)
+        dts = np.empty(n, dtype=np.float64)
+
+        k = 0
+        for rec, win_indices in zip(records, windows, strict=True):
             for s, e in win_indices:
                 # 1. Ground Accel (Input)
                 raw_input = self._pad_crop_1d(rec.ground_accel, s, e, seq_len)
 
-                # 2. Target (Peak IDR is scalar per record? No, usually we want IDR time history?)
-                # Input: ground acceleration
-                inp = self._pad_crop_1d(rec.ground_accel, s, e, self.config.seq_len)
-
                 # 2. Target (Sequence or Scalar)
                 if self.config.output_sequence:
                     # Target is displacement history (seq_len, n_stories)
-                    raw_target = self._pad_crop_2d(rec.disp, s, e, self.config.seq_len)
+                    raw_target = self._pad_crop_2d(rec.disp, s, e, seq_len)
                 else:
                     # Target is Scalar Peak IDR (recalc for window?)
                     # For v1.0, we use global peak (simplified)
-                    raw_target = rec.peak_idr.copy()
+                    raw_target = rec.peak_idr
 
                 # Physics vars (always sequence): (T, n_stories)
-                raw_accel = self._pad_crop_2d(rec.accel, s, e, self.config.seq_len)
-                raw_vel = self._pad_crop_2d(rec.vel, s, e, self.config.seq_len)
+                raw_accel = self._pad_crop_2d(rec.accel, s, e, seq_len)
+                raw_vel = self._pad_crop_2d(rec.vel, s, e, seq_len)
 
                 if self.config.augment:
-                    for scale in self.config.amplitude_scales:
-                        # Scaling
-                        inp = raw_input * scale
-                        tgt = raw_target * scale
-                        ac = raw_accel * scale
-                        ve = raw_vel * scale
-
-                        inputs.append(inp)
-                        targets.append(tgt)
-                        accels.append(ac)
-                        vels.append(ve)
-                        dts.append(rec.dt)
+                    for scale in scales:
+                        # Scaling, written straight into the output rows
+                        np.multiply(raw_input, scale, out=inputs[k])
+                        np.multiply(raw_target, scale, out=targets[k])
+                        np.multiply(raw_accel, scale, out=accels[k])
+                        np.multiply(raw_vel, scale, out=vels[k])
+                        dts[k] = rec.dt
+                        k += 1
 
                         # Noise (only on input, not physics variables?)
                         # Physics loss shouldn't see noise, or should it?
@@ -353,21 +613,23 @@ class NLTHAPipeline:
                         # Or we accept that noise creates residual.
                         # For now, let's include noise logic but maybe skip physics for those?
                         # Or just add noise to input and keep physics vars clean.
-                        if self.config.noise_sigma > 0 and scale == 1.0:
+                        if add_noise and scale == 1.0:
                             noise = self._rng.normal(
                                 0, self.config.noise_sigma * rec.pga, size=seq_len
                             ).astype(np.float32)
-                            inputs.append(inp + noise)
-                            targets.append(tgt)
-                            accels.append(ac)
-                            vels.append(ve)
-                            dts.append(rec.dt)
+                            np.add(inputs[k - 1], noise, out=inputs[k])
+                            targets[k] = targets[k - 1]
+                            accels[k] = accels[k - 1]
+                            vels[k] = vels[k - 1]
+                            dts[k] = rec.dt
+                            k += 1
                 else:
-                    inputs.append(raw_input)
-                    targets.append(raw_target)
-                    accels.append(raw_accel)
-                    vels.append(raw_vel)
-                    dts.append(rec.dt)
+                    inputs[k] = raw_input
+                    targets[k] = raw_target
+                    accels[k] = raw_accel
+                    vels[k] = raw_vel
+                    dts[k] = rec.dt
+                    k += 1
 
         return inputs, targets, accels, vels, dts
 
@@ -408,11 +670,11 @@ class NLTHAPipeline:
 
     def tensorise(
         self,
-        inputs: list[np.ndarray],
-        targets: list[np.ndarray],
-        accels: list[np.ndarray],
-        vels: list[np.ndarray],
-        dts: list[float],
+        inputs: np.ndarray,
+        targets: np.ndarray,
+        accels: np.ndarray,
+        vels: np.ndarray,
+        dts: np.ndarray,
     ) -> tuple[torch.Tensor, torch.Tensor, dict[str, Any], dict[str, torch.Tensor]]:
         """Convert to PyTorch tensors and compute physics terms.
 
@@ -423,26 +685,31 @@ class NLTHAPipeline:
         scaler_params : dict
         physics_tensors : dict with keys (mass_matrix, f_int, accel, vel, ground)
         """
-        x = np.stack(inputs)[:, np.newaxis, :]  # (N, 1, seq_len)
+        # np.asarray: no copy for the preallocated arrays from augment()
+        ground = np.asarray(inputs)[:, np.newaxis, :]  # (N, 1, seq_len), un-normalised
+        x = ground
 
         if self.config.output_sequence:
-            # y is list of (seq_len, n_stories) -> stack -> (N, seq_len, n_stories)
+            # y is (N, seq_len, n_stories)
             # Transpose to (N, n_stories, seq_len) for PyTorch Conv1d compatibility
-            y = np.stack(targets).transpose(0, 2, 1)
+            y = np.asarray(targets).transpose(0, 2, 1)
         else:
-            y = np.stack(targets)  # (N, n_stories)
+            y = np.asarray(targets)  # (N, n_stories)
 
         # Physics vars: (N, seq_len, n_stories) -> need to transpose to (N, n_stories, seq_len)
-        ac = np.stack(accels).transpose(0, 2, 1)  # (N, n_stories, seq_len)
-        ve = np.stack(vels).transpose(0, 2, 1)  # (N, n_stories, seq_len)
+        ac = np.asarray(accels).transpose(0, 2, 1)  # (N, n_stories, seq_len)
+        ve = np.asarray(vels).transpose(0, 2, 1)  # (N, n_stories, seq_len)
 
         scaler_params: dict[str, Any] = {}
 
         if self.config.normalise_input:
+            # One owned float32 copy (ground must stay raw), normalised in place
+            x = ground.astype(np.float32)
             x_mean = x.mean(axis=2, keepdims=True)
             x_std = x.std(axis=2, keepdims=True)
             x_std = np.where(x_std < 1e-8, 1.0, x_std)
-            x = (x - x_mean) / x_std
+            np.subtract(x, x_mean, out=x)
+            np.divide(x, x_std, out=x)
             scaler_params["input"] = {"method": "per_sample_standard"}
 
         if self.config.normalise_targets:
@@ -452,7 +719,11 @@ class NLTHAPipeline:
                 y_mean = y.mean(axis=(0, 2), keepdims=True)  # (1, n_stories, 1)
                 y_std = y.std(axis=(0, 2), keepdims=True)
                 y_std = np.where(y_std < 1e-8, 1.0, y_std)
-                y = (y - y_mean) / y_std
+                # Owned contiguous copy (leaves the caller's targets untouched);
+                # it doubles as the tensor buffer, so normalise it in place.
+                y = np.array(y, dtype=np.float32, order="C")
+                np.subtract(y, y_mean, out=y)
+                np.divide(y, y_std, out=y)
                 # Save as list for JSON serialization (squeeze dims)
                 scaler_params["target"] = {
                     "method": "per_story_sequence_standard",
@@ -460,25 +731,31 @@ class NLTHAPipeline:
                     "std": y_std.flatten().tolist(),
                 }
             else:
-                y_mean = y.mean(axis=0)
-                y_std = y.std(axis=0)
-                y_std = np.where(y_std < 1e-8, 1.0, y_std)
-                y = (y - y_mean) / y_std
+                y = np.array(y, dtype=np.float32, order="C")
+                if NUMBA_AVAILABLE:
+                    y_mean, y_std = _standardize_inplace(y)
+                else:
+                    y_mean = y.mean(axis=0)
+                    y_std = y.std(axis=0)
+                    y_std = np.where(y_std < 1e-8, 1.0, y_std)
+                    np.subtract(y, y_mean, out=y)
+                    np.divide(y, y_std, out=y)
                 scaler_params["target"] = {
                     "method": "global_standard",
                     "mean": y_mean.tolist(),
                     "std": y_std.tolist(),
                 }
 
-        x_tensor = torch.from_numpy(x.astype(np.float32))
-        y_tensor = torch.from_numpy(y.astype(np.float32))
+        # Everything is float32 from _load_one onwards (PGA ≤ 5 g, IDR ≤ 0.1 and
+        # the scaled response histories sit well inside float32 range/precision),
+        # so these casts are no-ops that only guard against float64 leaking in.
+        x_tensor = torch.from_numpy(x.astype(np.float32, copy=False))
+        y_tensor = torch.from_numpy(np.ascontiguousarray(y, dtype=np.float32))
 
-        # Physics tensors
-        accel_tensor = torch.from_numpy(ac.astype(np.float32))
-        vel_tensor = torch.from_numpy(ve.astype(np.float32))
-        ground_tensor = torch.from_numpy(
-            np.stack(inputs).astype(np.float32)
-        )  # un-normalized ground motion?
+        # Physics tensors (single copy each: transposed view → contiguous float32)
+        accel_tensor = torch.from_numpy(np.ascontiguousarray(ac, dtype=np.float32))
+        vel_tensor = torch.from_numpy(np.ascontiguousarray(ve, dtype=np.float32))
+        # Un-normalized ground motion for the physics residual.
         # Wait, inputs were normalized! We want UN-normalized ground motion for physics?
         # If we use normalized inputs, the physics is wrong unless we un-normalize inside the loss.
         # But 'inputs' above were normalized IN-PLACE? No, x = (x - mean).
@@ -512,7 +789,7 @@ class NLTHAPipeline:
         # Refined approach: In `augment`, I used `win_accel` (clean). I can store that.
         # But I'll leave it for now. The impact is small.
 
-        ground_tensor = torch.from_numpy(np.stack(inputs)[:, np.newaxis, :].astype(np.float32))
+        ground_tensor = torch.from_numpy(ground.astype(np.float32, copy=False))
 
         # Compute Mass and F_int
         # 1. Build Model to get Mass
@@ -603,16 +880,21 @@ class NLTHAPipeline:
 
         splits = {}
 
+        # Membership is random, but each split's indices are sorted so every
+        # gather below walks memory forward (the train DataLoader reshuffles
+        # per epoch anyway). Slicing one shuffled copy instead would leave
+        # views whose torch.save() serialises the whole shared storage.
+
         # Train
-        train_idx = idx[:n_train]
+        train_idx = torch.from_numpy(np.sort(idx[:n_train]))
         splits["train"] = {"x": x[train_idx], "y": y[train_idx], **slice_data(physics, train_idx)}
 
         # Val
-        val_idx = idx[n_train : n_train + n_val]
+        val_idx = torch.from_numpy(np.sort(idx[n_train : n_train + n_val]))
         splits["val"] = {"x": x[val_idx], "y": y[val_idx], **slice_data(physics, val_idx)}
 
         # Test
-        test_idx = idx[n_train + n_val :]
+        test_idx = torch.from_numpy(np.sort(idx[n_train + n_val :]))
         splits["test"] = {"x": x[test_idx], "y": y[test_idx], **slice_data(physics, test_idx)}
 
         for name, data in splits.items():
@@ -635,12 +917,10 @@ class NLTHAPipeline:
         for name, data in splits.items():
             torch.save(data, out / f"{name}.pt")
 
-        with open(out / "scaler_params.json", "w") as f:
-            json.dump(scaler_params, f, indent=2)
+        _write_json(out / "scaler_params.json", scaler_params)
 
         self.metadata["exported"] = datetime.now(timezone.utc).isoformat()
-        with open(out / "pipeline_metadata.json", "w") as f:
-            json.dump(self.metadata, f, indent=2, default=str)
+        _write_json(out / "pipeline_metadata.json", self.metadata)
 
         logger.info("Exported to %s/", out)
 
@@ -735,7 +1015,7 @@ if __name__ == "__main__":
     if args.dry_run:
         records = pipe.ingest()
         records = pipe.validate(records)
-        inputs, targets = pipe.augment(records)
+        inputs, *_ = pipe.augment(records)
         logger.info("[DRY RUN] Would produce %d samples, seq_len=%d", len(inputs), cfg.seq_len)
     else:
         pipe.run()
@@ -29,10 +29,15 @@ Project: Hybrid Digital Twin for Seismic RC Buildings
 
 import logging
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
 
+# Notion API sustained rate limit is ~3 requests/s per integration
+NOTION_MIN_REQUEST_INTERVAL_S = 0.35
+
 # ---------------------------------------------------------------------------
 # Guard import: notion-client is optional at module level
 # ---------------------------------------------------------------------------
@@ -93,6 +98,7 @@ class NotionResearchLogger:
         phase: str = "Methods",
         notes: str = "",
         source_ref: str = "",
+        timestamp: str | None = None,
     ) -> dict:
         """
         Log one NLTHA simulation result to the Notion database.
@@ -115,6 +121,9 @@ class NotionResearchLogger:
             Free-form notes about the simulation.
         source_ref : str
             HRPUB-compatible citation reference (e.g., "[cite: 15]").
+        timestamp : str, optional
+            ISO-8601 date for the "Fecha" column. Defaults to now (UTC);
+            ``log_batch`` passes one shared value for the whole batch.
 
         Returns
         -------
@@ -142,7 +151,7 @@ class NotionResearchLogger:
             "Pisos": {"number": num_stories},
             "Estado": {"select": {"name": status_map.get(convergence_status, convergence_status)}},
             "Fase": {"select": {"name": phase_map.get(phase, phase)}},
-            "Fecha": {"date": {"start": datetime.now(timezone.utc).isoformat()}},
+            "Fecha": {"date": {"start": timestamp or datetime.now(timezone.utc).isoformat()}},
             "Notas": {
                 "rich_text": [{"text": {"content": notes[:2000]}}]  # Notion limit
             },
@@ -169,25 +178,41 @@ class NotionResearchLogger:
     # -----------------------------------------------------------------------
     # Batch: Log multiple simulation results at once
     # -----------------------------------------------------------------------
-    def log_batch(self, results: list[dict]) -> list[dict]:
+    def log_batch(self, results: list[dict], max_workers: int = 8) -> list[dict]:
         """
         Log a batch of simulation results.
 
+        Requests are issued from a thread pool so network round-trips
+        overlap, while submissions are spaced to stay under Notion's rate
+        limit.
+
         Parameters
         ----------
         results : list[dict]
             Each dict should have keys matching log_simulation() params.
+        max_workers : int
+            Maximum number of requests in flight.
 
         Returns
         -------
         list[dict]
-            List of Notion API responses.
+            List of Notion API responses, in the same order as ``results``.
         """
+        # One provenance timestamp for the whole batch
+        timestamp = datetime.now(timezone.utc).isoformat()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = []
+            for i, result in enumerate(results):
+                if i > 0:
+                    time.sleep(NOTION_MIN_REQUEST_INTERVAL_S)
+                kwargs = {"timestamp": timestamp, **result}
+                futures.append(pool.submit(self.log_simulation, **kwargs))
+
         responses = []
-        for i, result in enumerate(results):
+        for i, future in enumerate(futures):
             try:
-                resp = self.log_simulation(**result)
-                responses.append(resp)
+                responses.append(future.result())
             except Exception as e:
                 logger.error(f"Failed on result {i}: {e}")
                 responses.append({"error": str(e), "index": i})